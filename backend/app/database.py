@@ -3,12 +3,19 @@ from __future__ import annotations
 
 from collections.abc import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import Connection, create_engine, select, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session, sessionmaker
 
 from .models import Base, RoadSegment, Sensor, SensorType
 from .settings import settings
 
+_DIALECT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+# Single-column indexes from the initial schema now covered by composite indexes
+_REDUNDANT_INDEXES = ("ix_sensor_readings_sensor_id", "ix_incidents_road_segment_id")
+
 
 def _build_engine() -> tuple[str, dict[str, object]]:
     """Return database URL and engine kwargs compatible with SQLite or Postgres."""
@@ -17,13 +24,20 @@ def _build_engine() -> tuple[str, dict[str, object]]:
 
     if database_url.startswith("sqlite"):
         engine_kwargs["connect_args"] = {"check_same_thread": False}
+    else:
+        engine_kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_pre_ping=True,
+        )
 
     return database_url, engine_kwargs
 
 
 database_url, engine_kwargs = _build_engine()
 engine = create_engine(database_url, **engine_kwargs)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -37,11 +51,48 @@ def get_db() -> Generator[Session, None, None]:
 
 def init_db() -> None:
     """Create database tables and ensure reference data exists."""
-    Base.metadata.create_all(bind=engine)
+    # Postgres builds indexes CONCURRENTLY so live tables keep taking writes, which
+    # cannot happen inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        Base.metadata.create_all(bind=connection)
+        _drop_invalid_indexes(connection)
+        _ensure_indexes(connection)
+        _drop_redundant_indexes(connection)
     with SessionLocal() as session:
         _seed_reference_data(session)
 
 
+def _ensure_indexes(connection: Connection) -> None:
+    """Create indexes declared after the initial schema on pre-existing tables."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=connection, checkfirst=True)
+
+
+def _drop_invalid_indexes(connection: Connection) -> None:
+    """Drop declared indexes a failed CREATE INDEX CONCURRENTLY left INVALID so they get rebuilt."""
+    # checkfirst only sees that the index name exists, not that Postgres never finished building it
+    if connection.dialect.name != "postgresql":
+        return
+    declared = [index.name for table in Base.metadata.sorted_tables for index in table.indexes]
+    invalid = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE NOT i.indisvalid AND pg_table_is_visible(c.oid) AND c.relname = ANY(:names)"
+        ),
+        {"names": declared},
+    ).scalars()
+    for name in invalid:
+        connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+
+
+def _drop_redundant_indexes(connection: Connection) -> None:
+    """Drop initial-schema indexes that the composite indexes make redundant."""
+    concurrently = "CONCURRENTLY " if connection.dialect.name == "postgresql" else ""
+    for name in _REDUNDANT_INDEXES:
+        connection.execute(text(f"DROP INDEX {concurrently}IF EXISTS {name}"))
+
+
 def _seed_reference_data(session: Session) -> None:
     """Seed Cincinnati highway segments and sensors with well-known IDs."""
     # Cincinnati area road segments
@@ -51,65 +102,63 @@ def _seed_reference_data(session: Session) -> None:
         ("I275_E_SEG_A", "I-275 East - Airport to Anderson", "EAST", 39.06, -84.42),
         ("I74_W_SEG_A", "I-74 West - Downtown to Harrison", "WEST", 39.14, -84.62),
     ]
-    
-    segments = []
-    for code, name, direction, lat, lng in segment_specs:
-        segment = session.query(RoadSegment).filter(RoadSegment.code == code).one_or_none()
-        if segment is None:
-            segment = RoadSegment(
-                name=name,
-                code=code,
-                direction=direction,
-                latitude=lat,
-                longitude=lng,
-            )
-            session.add(segment)
-            session.flush()
-        segments.append(segment)
-
-    # Add sensors for first segment (backwards compatible)
-    segment = segments[0]
+    segment_rows = [
+        {"code": code, "name": name, "direction": direction, "latitude": lat, "longitude": lng}
+        for code, name, direction, lat, lng in segment_specs
+    ]
+    _insert_ignoring_conflicts(session, RoadSegment, segment_rows, ["code"])
+
+    codes = [row["code"] for row in segment_rows]
+    segment_ids = dict(
+        session.execute(select(RoadSegment.code, RoadSegment.id).where(RoadSegment.code.in_(codes))).all()
+    )
+    segments = [(segment_ids[row["code"]], row["name"]) for row in segment_rows]
+
+    sensor_rows = []
+
+    # Sensors for first segment (backwards compatible)
+    segment_id, _ = segments[0]
     sensor_specs = (
         (1, "Segment A Flow Sensor", SensorType.TRAFFIC_FLOW),
         (2, "Segment A Speed Sensor", SensorType.SPEED),
         (3, "Segment A Stopped Vehicle Sensor", SensorType.STOPPED_VEHICLE),
     )
-
     for sensor_id, name, sensor_type in sensor_specs:
-        exists = session.query(Sensor).filter(Sensor.id == sensor_id).one_or_none()
-        if exists is not None:
-            continue
-
-        session.add(
-            Sensor(
-                id=sensor_id,
-                name=name,
-                type=sensor_type,
-                road_segment_id=segment.id,
-                is_active=True,
-            )
-        )
-    
-    # Add sensors for other segments
+        sensor_rows.append(_sensor_row(sensor_id, name, sensor_type, segment_id))
+
+    # Sensors for other segments
     sensor_id_start = 4
-    for i, seg in enumerate(segments[1:], start=1):
+    for i, (segment_id, segment_name) in enumerate(segments[1:], start=1):
         for j, (name_suffix, sensor_type) in enumerate([
             ("Flow Sensor", SensorType.TRAFFIC_FLOW),
             ("Speed Sensor", SensorType.SPEED),
             ("Stopped Vehicle Sensor", SensorType.STOPPED_VEHICLE),
         ]):
             sensor_id = sensor_id_start + (i - 1) * 3 + j
-            exists = session.query(Sensor).filter(Sensor.id == sensor_id).one_or_none()
-            if exists is not None:
-                continue
-            session.add(
-                Sensor(
-                    id=sensor_id,
-                    name=f"{seg.name.split(' - ')[0]} {name_suffix}",
-                    type=sensor_type,
-                    road_segment_id=seg.id,
-                    is_active=True,
-                )
-            )
+            name = f"{segment_name.split(' - ')[0]} {name_suffix}"
+            sensor_rows.append(_sensor_row(sensor_id, name, sensor_type, segment_id))
 
+    _insert_ignoring_conflicts(session, Sensor, sensor_rows, ["id"])
     session.commit()
+
+
+def _sensor_row(sensor_id: int, name: str, sensor_type: SensorType, road_segment_id: int) -> dict[str, object]:
+    """Build an insert row for a seeded sensor."""
+    return {
+        "id": sensor_id,
+        "name": name,
+        "type": sensor_type,
+        "road_segment_id": road_segment_id,
+        "is_active": True,
+    }
+
+
+def _insert_ignoring_conflicts(
+    session: Session, model: type[Base], rows: list[dict[str, object]], index_elements: list[str]
+) -> None:
+    """Bulk insert rows, skipping any that collide on the given unique columns."""
+    dialect = session.get_bind().dialect.name
+    insert = _DIALECT_INSERTS.get(dialect)
+    if insert is None:
+        raise RuntimeError(f"Reference data seeding is not supported for the {dialect} dialect")
+    session.execute(insert(model).values(rows).on_conflict_do_nothing(index_elements=index_elements))
@@ -1,12 +1,14 @@
 """Incident detection logic for Beltways RTIIS."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Collection
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from statistics import mean
+from itertools import groupby
 from typing import Sequence
 
-from sqlalchemy.orm import Session
+from sqlalchemy import case, func, lambda_stmt, select
+from sqlalchemy.orm import Session, contains_eager
 
 from .models import (
     Incident,
@@ -21,14 +23,20 @@ from .models import (
 CONGESTION_RULE = "FLOW_DROP_AND_SPEED_DROP"
 STOPPED_VEHICLE_RULE = "STOPPED_VEHICLE_DETECTED"
 
+_SENSOR_TYPES = (SensorType.TRAFFIC_FLOW, SensorType.SPEED, SensorType.STOPPED_VEHICLE)
+_NUMERIC_TYPES = (int, float)
+
+Baselines = tuple[float | None, float | None]
+OpenIncidents = dict[tuple[int, str], Incident]
+
 
 @dataclass(slots=True)
 class SegmentReadings:
     """Recent readings grouped by sensor category for a segment."""
 
-    flow: list[SensorReading]
-    speed: list[SensorReading]
-    stopped: list[SensorReading]
+    flow: list[SensorReading] = field(default_factory=list)
+    speed: list[SensorReading] = field(default_factory=list)
+    stopped: list[SensorReading] = field(default_factory=list)
 
     def as_dict(self) -> dict[str, list[SensorReading]]:
         """Return a dict representation useful for serialization or AI prompts."""
@@ -38,25 +46,9 @@ class SegmentReadings:
 def collect_recent_readings(db: Session, road_segment_id: int, minutes: int = 10) -> SegmentReadings:
     """Fetch readings across all sensor types for the recent window."""
 
-    def _fetch(sensor_type: SensorType) -> list[SensorReading]:
-        since = datetime.now(timezone.utc) - timedelta(minutes=minutes)
-        return (
-            db.query(SensorReading)
-            .join(Sensor)
-            .filter(
-                Sensor.road_segment_id == road_segment_id,
-                Sensor.type == sensor_type,
-                SensorReading.timestamp >= since,
-            )
-            .order_by(SensorReading.timestamp.asc())
-            .all()
-        )
-
-    return SegmentReadings(
-        flow=_fetch(SensorType.TRAFFIC_FLOW),
-        speed=_fetch(SensorType.SPEED),
-        stopped=_fetch(SensorType.STOPPED_VEHICLE),
-    )
+    since = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+    bundles = _collect_readings_by_segment(db, [road_segment_id], since)
+    return bundles.get(road_segment_id) or SegmentReadings()
 
 
 def evaluate_incidents_for_segment(db: Session, road_segment_id: int) -> list[Incident]:
@@ -66,39 +58,151 @@ def evaluate_incidents_for_segment(db: Session, road_segment_id: int) -> list[In
     if segment is None:
         return []
 
-    readings = collect_recent_readings(db, road_segment_id)
+    return _evaluate_segments(db, [segment.id])
+
+
+def evaluate_incidents_for_segments(db: Session, segment_ids: Collection[int]) -> list[Incident]:
+    """Evaluate detection rules for several segments together and return newly created incidents."""
+
+    if not segment_ids:
+        return []
+
+    return _evaluate_segments(db, segment_ids)
+
+
+def evaluate_incidents_for_all_segments(db: Session) -> list[Incident]:
+    """Evaluate detection rules for every segment with recent readings."""
+
+    return _evaluate_segments(db, None)
+
+
+def _evaluate_segments(db: Session, segment_ids: Collection[int] | None) -> list[Incident]:
+    """Run all detection rules over the given segments (or all when None) in batched queries."""
+
+    now = datetime.now(timezone.utc)
+    readings_by_segment = _collect_readings_by_segment(db, segment_ids, now - timedelta(minutes=10))
+    if not readings_by_segment:
+        return []
+
+    active_ids = list(readings_by_segment)
+    congestion_candidates = [
+        segment_id
+        for segment_id, readings in readings_by_segment.items()
+        if len(readings.flow) >= 2 and len(readings.speed) >= 2
+    ]
+    baselines = _baselines_by_segment(db, congestion_candidates, now) if congestion_candidates else {}
+    open_incidents = _open_incidents_by_key(db, active_ids)
     new_incidents: list[Incident] = []
 
-    congestion_incident = _maybe_create_congestion_incident(db, segment, readings)
-    if congestion_incident is not None:
-        new_incidents.append(congestion_incident)
+    for segment_id, readings in readings_by_segment.items():
+        congestion_incident = _maybe_create_congestion_incident(
+            db, segment_id, readings, baselines.get(segment_id, (None, None)), open_incidents, now
+        )
+        if congestion_incident is not None:
+            new_incidents.append(congestion_incident)
 
-    stopped_incident = _maybe_create_stopped_vehicle_incident(db, segment, readings)
-    if stopped_incident is not None:
-        new_incidents.append(stopped_incident)
+        stopped_incident = _maybe_create_stopped_vehicle_incident(
+            db, segment_id, readings, open_incidents, now
+        )
+        if stopped_incident is not None:
+            new_incidents.append(stopped_incident)
 
     if new_incidents:
         db.flush()
     return new_incidents
 
 
+def _collect_readings_by_segment(
+    db: Session, segment_ids: Collection[int] | None, since: datetime
+) -> dict[int, SegmentReadings]:
+    """Fetch recent readings for several segments in one query, bucketed per segment and type."""
+
+    # lambda_stmt caches the constructed statement, so repeat calls only rebind since/segment_ids
+    stmt = lambda_stmt(
+        lambda: select(SensorReading)
+        .join(SensorReading.sensor)
+        .options(contains_eager(SensorReading.sensor))
+        .where(Sensor.type.in_(_SENSOR_TYPES), SensorReading.timestamp >= since)
+        .order_by(Sensor.road_segment_id, SensorReading.timestamp.asc())
+    )
+    if segment_ids is not None:
+        segment_id_list = list(segment_ids)
+        stmt += lambda s: s.where(Sensor.road_segment_id.in_(segment_id_list))
+
+    bundles: dict[int, SegmentReadings] = {}
+    readings = db.execute(stmt).scalars().all()
+    for segment_id, rows in groupby(readings, key=lambda reading: reading.sensor.road_segment_id):
+        buckets: dict[SensorType, list[SensorReading]] = {sensor_type: [] for sensor_type in _SENSOR_TYPES}
+        for reading in rows:
+            buckets[reading.sensor.type].append(reading)
+        bundles[segment_id] = SegmentReadings(
+            flow=buckets[SensorType.TRAFFIC_FLOW],
+            speed=buckets[SensorType.SPEED],
+            stopped=buckets[SensorType.STOPPED_VEHICLE],
+        )
+    return bundles
+
+
+def _baselines_by_segment(
+    db: Session,
+    segment_ids: Collection[int],
+    now: datetime,
+    minutes: int = 5,
+    exclude_recent_seconds: int = 30,
+) -> dict[int, Baselines]:
+    """Average flow and speed per segment over the baseline window in one grouped query."""
+
+    flow_value = SensorReading.data["vehicles_per_minute"].as_float()
+    speed_value = SensorReading.data["avg_speed_kmh"].as_float()
+    stmt = (
+        select(
+            Sensor.road_segment_id,
+            func.avg(case((Sensor.type == SensorType.TRAFFIC_FLOW, flow_value))),
+            func.avg(case((Sensor.type == SensorType.SPEED, speed_value))),
+        )
+        .select_from(SensorReading)
+        .join(Sensor)
+        .where(
+            Sensor.road_segment_id.in_(segment_ids),
+            Sensor.type.in_((SensorType.TRAFFIC_FLOW, SensorType.SPEED)),
+            SensorReading.timestamp >= now - timedelta(minutes=minutes),
+            SensorReading.timestamp <= now - timedelta(seconds=exclude_recent_seconds),
+        )
+        .group_by(Sensor.road_segment_id)
+    )
+    return {segment_id: (flow, speed) for segment_id, flow, speed in db.execute(stmt).all()}
+
+
+def _open_incidents_by_key(db: Session, segment_ids: Collection[int]) -> OpenIncidents:
+    """Map (segment id, incident type) to the newest open incident for the given segments."""
+
+    incidents = (
+        db.query(Incident)
+        .filter(
+            Incident.road_segment_id.in_(segment_ids),
+            Incident.status == IncidentStatus.OPEN,
+        )
+        .order_by(Incident.created_at.asc())
+        .all()
+    )
+    return {(incident.road_segment_id, incident.type): incident for incident in incidents}
+
+
 def _maybe_create_congestion_incident(
-    db: Session, segment: RoadSegment, readings: SegmentReadings
+    db: Session,
+    road_segment_id: int,
+    readings: SegmentReadings,
+    baselines: Baselines,
+    open_incidents: OpenIncidents,
+    now: datetime,
 ) -> Incident | None:
     """Create a congestion incident if sustained flow and speed drops are detected."""
 
-    flow_values = _extract_numeric_series(readings.flow, "vehicles_per_minute")
-    speed_values = _extract_numeric_series(readings.speed, "avg_speed_kmh")
-
-    if len(flow_values) < 2 or len(speed_values) < 2:
+    # Cheapest and most selective gates first: row counts, then the precomputed baselines
+    if len(readings.flow) < 2 or len(readings.speed) < 2:
         return None
 
-    baseline_flow = _window_average(
-        readings.flow, "vehicles_per_minute", minutes=5, exclude_recent_seconds=30
-    )
-    baseline_speed = _window_average(
-        readings.speed, "avg_speed_kmh", minutes=5, exclude_recent_seconds=30
-    )
+    baseline_flow, baseline_speed = baselines
 
     if baseline_flow is None or baseline_speed is None:
         return None
@@ -106,29 +210,39 @@ def _maybe_create_congestion_incident(
     if baseline_flow < 30 or baseline_speed < 60:
         return None
 
-    last_flow = flow_values[-2:]
-    last_speed = speed_values[-2:]
+    flow_values = _extract_numeric_series(readings.flow, "vehicles_per_minute")
+    if len(flow_values) < 2:
+        return None
 
     flow_threshold = baseline_flow * 0.4
-    speed_threshold = 25.0
+    if not all(value <= flow_threshold for value in flow_values[-2:]):
+        return None
 
-    flow_sustained = all(value <= flow_threshold for value in last_flow)
-    speed_sustained = all(value <= speed_threshold for value in last_speed)
+    speed_values = _extract_numeric_series(readings.speed, "avg_speed_kmh")
+    if len(speed_values) < 2:
+        return None
 
-    if not (flow_sustained and speed_sustained):
+    speed_threshold = 25.0
+    if not all(value <= speed_threshold for value in speed_values[-2:]):
         return None
 
     return _upsert_incident(
         db=db,
-        road_segment_id=segment.id,
+        road_segment_id=road_segment_id,
         incident_type="CONGESTION",
         severity=IncidentSeverity.HIGH,
         rule_name=CONGESTION_RULE,
+        open_incidents=open_incidents,
+        now=now,
     )
 
 
 def _maybe_create_stopped_vehicle_incident(
-    db: Session, segment: RoadSegment, readings: SegmentReadings
+    db: Session,
+    road_segment_id: int,
+    readings: SegmentReadings,
+    open_incidents: OpenIncidents,
+    now: datetime,
 ) -> Incident | None:
     """Create a stopped vehicle incident when blockage persists for two cycles."""
 
@@ -146,44 +260,34 @@ def _maybe_create_stopped_vehicle_incident(
 
     return _upsert_incident(
         db=db,
-        road_segment_id=segment.id,
+        road_segment_id=road_segment_id,
         incident_type="STOPPED_VEHICLE",
         severity=IncidentSeverity.MEDIUM,
         rule_name=STOPPED_VEHICLE_RULE,
+        open_incidents=open_incidents,
+        now=now,
     )
 
 
 def _extract_numeric_series(readings: Sequence[SensorReading], key: str) -> list[float]:
     """Extract numeric values for a given key from ordered readings."""
 
-    values: list[float] = []
-    for reading in readings:
-        value = reading.data.get(key) if reading.data else None
-        if value is None:
-            continue
-        try:
-            values.append(float(value))
-        except (TypeError, ValueError):
-            continue
-    return values
-
-
-def _window_average(
-    readings: Sequence[SensorReading], key: str, minutes: int, exclude_recent_seconds: int = 0
-) -> float | None:
-    """Average values for a key within the trailing window length."""
-
-    cutoff = datetime.now(timezone.utc) - timedelta(minutes=minutes)
-    exclude_after = datetime.now(timezone.utc) - timedelta(seconds=exclude_recent_seconds)
-    window_values = [
-        float(reading.data.get(key))
-        for reading in readings
-        if _timestamp_utc(reading) >= cutoff
-        and _timestamp_utc(reading) <= exclude_after
-        and reading.data.get(key) is not None
+    values = [
+        value for reading in readings if reading.data and (value := reading.data.get(key)) is not None
     ]
+    # JSON payloads almost always decode to plain numbers; only coerce when something else slipped in
+    if all(type(value) in _NUMERIC_TYPES for value in values):
+        return values
+    return [number for number in map(_coerce_float, values) if number is not None]
 
-    return mean(window_values) if window_values else None
+
+def _coerce_float(value: object) -> float | None:
+    """Convert a payload value to float, returning None when it is not numeric."""
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
 
 
 def _upsert_incident(
@@ -192,21 +296,12 @@ def _upsert_incident(
     incident_type: str,
     severity: IncidentSeverity,
     rule_name: str,
+    open_incidents: OpenIncidents,
+    now: datetime,
 ) -> Incident | None:
     """Insert a new incident unless an open one already exists for the same type."""
 
-    existing = (
-        db.query(Incident)
-        .filter(
-            Incident.road_segment_id == road_segment_id,
-            Incident.type == incident_type,
-            Incident.status == IncidentStatus.OPEN,
-        )
-        .order_by(Incident.created_at.desc())
-        .first()
-    )
-
-    now = datetime.now(timezone.utc)
+    existing = open_incidents.get((road_segment_id, incident_type))
 
     if existing is not None:
         existing.updated_at = now
@@ -222,14 +317,5 @@ def _upsert_incident(
         updated_at=now,
     )
     db.add(incident)
-    db.flush()
+    open_incidents[(road_segment_id, incident_type)] = incident
     return incident
-
-
-def _timestamp_utc(reading: SensorReading) -> datetime:
-    """Return a timezone-aware UTC timestamp for a reading."""
-
-    timestamp = reading.timestamp
-    if timestamp.tzinfo is None:
-        return timestamp.replace(tzinfo=timezone.utc)
-    return timestamp.astimezone(timezone.utc)
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import json
 import logging
+from collections.abc import Sequence
 
 import httpx
 
@@ -10,7 +11,39 @@ from .models import Incident, RoadSegment, SensorReading
 from .settings import settings
 
 logger = logging.getLogger(__name__)
+
+IncidentContext = tuple[Incident, RoadSegment, dict[str, list[SensorReading]]]
 DEFAULT_OPENAI_MODEL = "gpt-4o-mini"
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+_SYSTEM_MESSAGE = {"role": "system", "content": "You are a traffic operations assistant."}
+_RESPONSE_INSTRUCTIONS = (
+    "Respond with a JSON object with key incidents: an array holding one object per incident below, "
+    "each with keys incident_id, summary, cause, recommendation.\nContext:\n"
+)
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use so connections are reused."""
+
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=20,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client, if one was created."""
+
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 async def analyze_incident_with_llm(
@@ -20,24 +53,34 @@ async def analyze_incident_with_llm(
 ) -> dict[str, str]:
     """Generate AI-derived summary, cause, and recommendations for an incident."""
 
-    prompt = _build_prompt(incident, segment, recent_readings)
+    results = await analyze_incidents_with_llm([(incident, segment, recent_readings)])
+    return results[incident.id]
+
+
+async def analyze_incidents_with_llm(contexts: Sequence[IncidentContext]) -> dict[int, dict[str, str]]:
+    """Generate AI fields for several incidents with a single LLM request, keyed by incident id."""
 
-    if not settings.openai_api_key:
-        return _dummy_response(incident)
+    results = {incident.id: _dummy_response(incident) for incident, _, _ in contexts}
+    if not contexts or not settings.openai_api_key:
+        return results
 
+    prompt = "\n\n".join(
+        _build_prompt(incident, segment, recent_readings) for incident, segment, recent_readings in contexts
+    )
     provider = settings.llm_provider.lower()
 
     try:
         if provider == "openai":
-            return await _call_openai(prompt)
+            ai_fields = await _call_openai(prompt)
+            results.update((incident_id, fields) for incident_id, fields in ai_fields.items() if incident_id in results)
     except Exception as exc:  # pragma: no cover - network failures
         logger.warning("LLM call failed, falling back to dummy response: %s", exc)
 
-    return _dummy_response(incident)
+    return results
 
 
-async def _call_openai(prompt: str) -> dict[str, str]:
-    """Call the OpenAI chat completions endpoint and parse structured response."""
+async def _call_openai(prompt: str) -> dict[int, dict[str, str]]:
+    """Call the OpenAI chat completions endpoint and parse per-incident structured responses."""
 
     headers = {
         "Authorization": f"Bearer {settings.openai_api_key}",
@@ -46,44 +89,46 @@ async def _call_openai(prompt: str) -> dict[str, str]:
     payload = {
         "model": DEFAULT_OPENAI_MODEL,
         "messages": [
-            {"role": "system", "content": "You are a traffic operations assistant."},
-            {
-                "role": "user",
-                "content": (
-                    "Respond with a JSON object containing keys summary, cause, recommendation.\n"
-                    f"Context:\n{prompt}"
-                ),
-            },
+            _SYSTEM_MESSAGE,
+            {"role": "user", "content": _RESPONSE_INSTRUCTIONS + prompt},
         ],
         "temperature": 0.2,
     }
 
-    async with httpx.AsyncClient(timeout=20) as client:
-        response = await client.post(
-            "https://api.openai.com/v1/chat/completions", headers=headers, json=payload
-        )
-        response.raise_for_status()
-        content = response.json()["choices"][0]["message"]["content"]
+    response = await get_client().post(OPENAI_CHAT_URL, headers=headers, json=payload)
+    response.raise_for_status()
+    content = response.json()["choices"][0]["message"]["content"]
 
     try:
         parsed = json.loads(content)
     except json.JSONDecodeError:
         logger.debug("Failed to parse LLM JSON response: %s", content)
-        return _dummy_response(None)
-
-    return {
-        "ai_summary": parsed.get("summary", ""),
-        "ai_cause": parsed.get("cause", ""),
-        "ai_recommendation": parsed.get("recommendation", ""),
-    }
+        return {}
+
+    entries = parsed.get("incidents") if isinstance(parsed, dict) else parsed
+    results: dict[int, dict[str, str]] = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            incident_id = int(entry.get("incident_id"))
+        except (TypeError, ValueError):
+            continue
+        results[incident_id] = {
+            "ai_summary": entry.get("summary", ""),
+            "ai_cause": entry.get("cause", ""),
+            "ai_recommendation": entry.get("recommendation", ""),
+        }
+    return results
 
 
 def _build_prompt(
     incident: Incident, segment: RoadSegment, recent_readings: dict[str, list[SensorReading]]
 ) -> str:
-    """Construct the textual prompt for the LLM."""
+    """Construct the textual prompt section for one incident."""
 
     lines = [
+        f"### Incident {incident.id}",
         f"Segment: {segment.name} ({segment.code}) direction {segment.direction}",
         f"Incident type: {incident.type}",
         f"Rule triggered: {incident.rule_triggered}",
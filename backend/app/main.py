@@ -1,25 +1,33 @@
 """FastAPI entrypoint for Beltways RTIIS."""
 from __future__ import annotations
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from .database import init_db
+from .llm import close_client
 from .routers import incidents, readings, segments, sensors, system
 from .schemas import HealthResponse
+from .settings import settings
 
+_HEALTH_BODY = b'{"status":"ok"}'
 
-class ProxyHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to handle proxy headers and preserve HTTPS scheme for redirects."""
-    
-    async def dispatch(self, request: Request, call_next):
-        # Trust X-Forwarded-Proto header from Railway's edge proxy
-        x_forwarded_proto = request.headers.get("x-forwarded-proto")
-        if x_forwarded_proto:
-            request.scope["scheme"] = x_forwarded_proto
-        response = await call_next(request)
-        return response
+
+class ProxyHeadersMiddleware:
+    """ASGI middleware to handle proxy headers and preserve HTTPS scheme for redirects."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            # Trust X-Forwarded-Proto header from Railway's edge proxy
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-proto":
+                    scope["scheme"] = value.decode("latin-1")
+                    break
+        await self.app(scope, receive, send)
 
 
 app = FastAPI(title="Beltways RTIIS")
@@ -30,7 +38,8 @@ app.add_middleware(ProxyHeadersMiddleware)
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=settings.cors_origin_list,
+    allow_origin_regex=settings.cors_origin_regex,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -43,10 +52,17 @@ async def startup_event() -> None:
     init_db()
 
 
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    """Release the shared LLM HTTP client."""
+    await close_client()
+
+
 @app.get("/health", response_model=HealthResponse)
-async def health() -> HealthResponse:
+async def health() -> Response:
     """Basic health check endpoint."""
-    return HealthResponse(status="ok")
+    # Returning a prebuilt Response skips model validation and serialization on this hot probe path
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 app.include_router(segments.router)
@@ -12,6 +12,7 @@ from sqlalchemy import (
 	Enum as SqlEnum,
 	Float,
 	ForeignKey,
+	Index,
 	Integer,
 	String,
 	Text,
@@ -82,9 +83,10 @@ class SensorReading(Base):
 	"""Individual sensor reading captured at a given moment in time."""
 
 	__tablename__ = "sensor_readings"
+	__table_args__ = (Index("ix_sensor_readings_sensor_ts", "sensor_id", "timestamp", postgresql_concurrently=True),)
 
 	id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-	sensor_id: Mapped[int] = mapped_column(ForeignKey("sensors.id", ondelete="CASCADE"), nullable=False, index=True)
+	sensor_id: Mapped[int] = mapped_column(ForeignKey("sensors.id", ondelete="CASCADE"), nullable=False)
 	timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
 	data: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
 
@@ -95,9 +97,19 @@ class Incident(Base):
 	"""Detected anomaly or event affecting a road segment."""
 
 	__tablename__ = "incidents"
+	__table_args__ = (
+		Index(
+			"ix_incidents_segment_status_created",
+			"road_segment_id",
+			"status",
+			"created_at",
+			postgresql_concurrently=True,
+		),
+		Index("ix_incidents_type_status_segment", "type", "status", "road_segment_id", postgresql_concurrently=True),
+	)
 
 	id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-	road_segment_id: Mapped[int] = mapped_column(ForeignKey("road_segments.id", ondelete="CASCADE"), nullable=False, index=True)
+	road_segment_id: Mapped[int] = mapped_column(ForeignKey("road_segments.id", ondelete="CASCADE"), nullable=False)
 	created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 	updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 	status: Mapped[IncidentStatus] = mapped_column(SqlEnum(IncidentStatus), default=IncidentStatus.OPEN, nullable=False)
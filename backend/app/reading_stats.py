@@ -0,0 +1,114 @@
+"""In-process rolling reading counters for the system status endpoint."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+
+WINDOW_SECONDS = 60.0
+
+ReadingStats = tuple[int, int, datetime | None]
+# (monotonic time the commit returned, readings, readings inside the window, latest timestamp)
+RecordedBatch = tuple[float, int, int, datetime]
+
+# Everything below is per process and guarded by _lock; deployments with several workers
+# rely on the periodic reconcile against the database to pick up each other's readings.
+_lock = threading.Lock()
+# (monotonic commit time, readings in that batch timestamped inside the window)
+_recent_batches: deque[tuple[float, int]] = deque()
+# Batches recorded during the window, replayed when a reconcile query started before they committed
+_recorded_batches: deque[RecordedBatch] = deque()
+# Monotonic time the last applied reconcile query started, or None before the first one
+_reconciled_at: float | None = None
+_total_readings = 0
+_last_reading_at: datetime | None = None
+
+
+def record_readings(timestamps: Iterable[datetime], committed_at: float) -> None:
+    """Count readings whose commit returned at monotonic time committed_at toward the counters."""
+
+    timestamps = list(timestamps)
+    if not timestamps:
+        return
+
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=WINDOW_SECONDS)
+    in_window = sum(1 for timestamp in timestamps if timestamp >= cutoff)
+    batch = (committed_at, len(timestamps), in_window, max(timestamps))
+
+    with _lock:
+        _recorded_batches.append(batch)
+        # A reconcile query that started after this commit already counted the batch
+        if _reconciled_at is None or committed_at > _reconciled_at:
+            _apply(batch)
+        _expire(time.monotonic())
+
+
+def current_stats(max_age_seconds: float) -> ReadingStats | None:
+    """Return (total, last-minute count, latest timestamp), or None when a reconcile is due."""
+
+    with _lock:
+        now = time.monotonic()
+        if _reconciled_at is None or now - _reconciled_at >= max_age_seconds:
+            return None
+        _expire(now)
+        return _snapshot()
+
+
+def reconcile(
+    total_readings: int,
+    readings_last_minute: int,
+    last_reading_at: datetime | None,
+    started_at: float,
+) -> ReadingStats:
+    """Reset the counters to figures from a database query started at monotonic time started_at."""
+
+    global _reconciled_at, _total_readings, _last_reading_at
+    # SQLite hands back naive datetimes; stored timestamps are UTC
+    if last_reading_at is not None and last_reading_at.tzinfo is None:
+        last_reading_at = last_reading_at.replace(tzinfo=timezone.utc)
+
+    with _lock:
+        # A concurrent status request may already have applied a fresher query
+        if _reconciled_at is None or started_at > _reconciled_at:
+            _reconciled_at = started_at
+            _total_readings = total_readings
+            _last_reading_at = last_reading_at
+            _recent_batches.clear()
+            if readings_last_minute:
+                _recent_batches.append((started_at, readings_last_minute))
+            # Batches committed once the query was running are missing from its figures
+            for batch in _recorded_batches:
+                if batch[0] > started_at:
+                    _apply(batch)
+        _expire(time.monotonic())
+        return _snapshot()
+
+
+def _apply(batch: RecordedBatch) -> None:
+    """Add a recorded batch to the counters; caller must hold the lock."""
+
+    global _total_readings, _last_reading_at
+    committed_at, count, in_window, latest = batch
+    _total_readings += count
+    if _last_reading_at is None or latest > _last_reading_at:
+        _last_reading_at = latest
+    if in_window:
+        _recent_batches.append((committed_at, in_window))
+
+
+def _snapshot() -> ReadingStats:
+    """Return the current counters; caller must hold the lock."""
+
+    return _total_readings, sum(count for _, count in _recent_batches), _last_reading_at
+
+
+def _expire(now: float) -> None:
+    """Drop batches recorded before the rolling window; caller must hold the lock."""
+
+    cutoff = now - WINDOW_SECONDS
+    while _recent_batches and _recent_batches[0][0] < cutoff:
+        _recent_batches.popleft()
+    while _recorded_batches and _recorded_batches[0][0] < cutoff:
+        _recorded_batches.popleft()
@@ -1,14 +1,17 @@
 """Incident endpoints."""
 from __future__ import annotations
 
+import heapq
+from collections import deque
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session, joinedload
 
 from ..database import get_db
 from ..detection import SegmentReadings, collect_recent_readings
-from ..models import Incident, IncidentStatus, RoadSegment
+from ..models import Incident, IncidentStatus
 from ..schemas import (
 	Incident as IncidentSchema,
 	IncidentDetail,
@@ -19,30 +22,33 @@ from ..schemas import (
 
 router = APIRouter(prefix="/api/incidents", tags=["incidents"])
 
+# Plain column rows serialize straight into the list schema without building ORM instances
+_INCIDENT_COLUMNS = tuple(getattr(Incident, name) for name in IncidentSchema.model_fields)
 
-@router.get("/", response_model=list[IncidentSchema])
-async def list_incidents(
+
+@router.get("/", response_model=list[IncidentSchema], response_model_exclude_none=True)
+def list_incidents(
 	status_filter: IncidentStatus | None = Query(default=None, alias="status"),
 	limit: int = Query(default=50, ge=1, le=200),
 	db: Session = Depends(get_db),
-) -> list[Incident]:
+) -> list[Row]:
 	"""Return incidents ordered from newest to oldest with optional status filter."""
 
-	query = db.query(Incident).order_by(Incident.created_at.desc())
+	stmt = select(*_INCIDENT_COLUMNS).order_by(Incident.created_at.desc())
 	if status_filter is not None:
-		query = query.filter(Incident.status == status_filter)
-	return query.limit(limit).all()
+		stmt = stmt.where(Incident.status == status_filter)
+	return db.execute(stmt.limit(limit)).all()
 
 
 @router.get("/{incident_id}", response_model=IncidentDetail)
-async def get_incident(incident_id: int, db: Session = Depends(get_db)) -> IncidentDetail:
+def get_incident(incident_id: int, db: Session = Depends(get_db)) -> IncidentDetail:
 	"""Return a single incident with its segment and recent readings."""
 
-	incident = db.get(Incident, incident_id)
+	incident = db.get(Incident, incident_id, options=[joinedload(Incident.road_segment)])
 	if incident is None:
 		raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Incident not found")
 
-	segment = incident.road_segment or db.get(RoadSegment, incident.road_segment_id)
+	segment = incident.road_segment
 	if segment is None:
 		raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Segment not found")
 
@@ -53,7 +59,7 @@ async def get_incident(incident_id: int, db: Session = Depends(get_db)) -> Incid
 
 
 @router.patch("/{incident_id}/resolve", response_model=ResolveIncidentResponse)
-async def resolve_incident(
+def resolve_incident(
 	incident_id: int,
 	payload: ResolveIncidentRequest,
 	db: Session = Depends(get_db),
@@ -67,16 +73,18 @@ async def resolve_incident(
 	incident.status = IncidentStatus.RESOLVED
 	incident.updated_at = datetime.now(timezone.utc)
 	incident.resolution_note = payload.resolution_note
+	resolved_id = incident.id
 	db.commit()
 
-	return ResolveIncidentResponse(status="ok", incident_id=incident.id)
+	return ResolveIncidentResponse(status="ok", incident_id=resolved_id)
 
 
 def _serialize_recent_readings(bundle: SegmentReadings) -> list[SensorReadingSchema]:
 	"""Flatten bundled readings into a single chronologically sorted list."""
 
-	merged = bundle.flow + bundle.speed + bundle.stopped
-	merged.sort(key=lambda reading: reading.timestamp)
+	# Each bundle list is already in timestamp order, so a k-way merge keeps only the newest 50
+	merged = heapq.merge(bundle.flow, bundle.speed, bundle.stopped, key=lambda reading: reading.timestamp)
+	latest = deque(merged, maxlen=50)
 
 	return [
 		SensorReadingSchema(
@@ -86,5 +94,5 @@ def _serialize_recent_readings(bundle: SegmentReadings) -> list[SensorReadingSch
 			data=reading.data,
 			sensor_type=getattr(reading.sensor, "type", None),
 		)
-		for reading in merged[-50:]
+		for reading in latest
 	]
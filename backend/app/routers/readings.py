@@ -1,100 +1,172 @@
 """Sensor reading ingestion endpoints."""
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import asyncio
+import math
+import time
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from ..database import get_db
-from ..detection import collect_recent_readings, evaluate_incidents_for_segment
-from ..llm import analyze_incident_with_llm
+from ..detection import collect_recent_readings, evaluate_incidents_for_segments
+from ..llm import IncidentContext, analyze_incidents_with_llm
 from ..models import Incident, RoadSegment, Sensor, SensorReading, SensorType
+from ..reading_stats import record_readings
 from ..schemas import ReadingsIngestRequest, ReadingsIngestResponse
+from ..settings import Settings, get_settings, settings
 
 router = APIRouter(prefix="/api/readings", tags=["readings"])
 
+# Bounds concurrent ingest work (and the LLM calls it triggers) per process
+_ingest_slots = asyncio.Semaphore(settings.ingest_concurrency)
+
+# Required payload keys per sensor type, with the error detail raised when any are missing
+_REQUIRED_PAYLOAD_KEYS: dict[SensorType, tuple[frozenset[str], str]] = {
+	SensorType.TRAFFIC_FLOW: (frozenset({"vehicles_per_minute"}), "Missing vehicles_per_minute for flow sensor"),
+	SensorType.SPEED: (frozenset({"avg_speed_kmh"}), "Missing avg_speed_kmh for speed sensor"),
+	SensorType.STOPPED_VEHICLE: (
+		frozenset({"stopped_count", "lane_blocked"}),
+		"Missing stopped_count or lane_blocked for stopped vehicle sensor",
+	),
+}
+
+# Keys detection compares numerically; baselines cast them to float in SQL, which fails on Postgres for
+# booleans and non-numeric text, so these must hold a number or a numeric string
+_NUMERIC_PAYLOAD_KEYS = frozenset({"vehicles_per_minute", "avg_speed_kmh", "stopped_count"})
+
 
 @router.post("/", response_model=ReadingsIngestResponse, status_code=status.HTTP_202_ACCEPTED)
 async def ingest_readings(
 	payload: ReadingsIngestRequest,
 	db: Session = Depends(get_db),
+	app_settings: Settings = Depends(get_settings),
 ) -> ReadingsIngestResponse:
 	"""Store sensor readings, evaluate detection rules, and trigger AI analysis."""
 
 	if not payload.readings:
 		return ReadingsIngestResponse(status="accepted", inserted_count=0, new_incidents=[])
 
-	sensors_cache: dict[int, Sensor] = {}
+	try:
+		await asyncio.wait_for(_ingest_slots.acquire(), timeout=app_settings.ingest_acquire_timeout_seconds)
+	except asyncio.TimeoutError:
+		raise HTTPException(
+			status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+			detail="Ingest capacity exceeded, retry later",
+			headers={"Retry-After": "1"},
+		) from None
+
+	try:
+		return await _ingest_batch(payload, db)
+	finally:
+		_ingest_slots.release()
+
+
+async def _ingest_batch(payload: ReadingsIngestRequest, db: Session) -> ReadingsIngestResponse:
+	"""Persist a validated batch, run detection for impacted segments, and enrich new incidents."""
+
+	# Blocking session work runs in the threadpool so the event loop stays free during DB I/O
+	new_incidents = await run_in_threadpool(_store_and_detect, payload, db)
+	await _populate_ai_fields(db, new_incidents)
+	new_incident_ids = [incident.id for incident in new_incidents]
+
+	committed_at = await run_in_threadpool(_commit, db)
+	record_readings((reading_payload.timestamp for reading_payload in payload.readings), committed_at=committed_at)
+
+	return ReadingsIngestResponse(
+		status="accepted",
+		inserted_count=len(payload.readings),
+		new_incidents=new_incident_ids,
+	)
+
+
+def _commit(db: Session) -> float:
+	"""Commit the session and return the monotonic time, taken in the worker thread, that it finished."""
+
+	db.commit()
+	return time.monotonic()
+
+
+def _store_and_detect(payload: ReadingsIngestRequest, db: Session) -> list[Incident]:
+	"""Validate and bulk-insert readings, then return incidents opened by detection."""
+
+	sensor_ids = {reading_payload.sensor_id for reading_payload in payload.readings}
+	sensors = db.execute(select(Sensor).where(Sensor.id.in_(sensor_ids))).scalars().all()
+	sensors_cache: dict[int, Sensor] = {sensor.id: sensor for sensor in sensors}
 	impacted_segments: set[int] = set()
+	rows: list[dict[str, Any]] = []
 
 	for reading_payload in payload.readings:
 		sensor = sensors_cache.get(reading_payload.sensor_id)
 		if sensor is None:
-			sensor = db.get(Sensor, reading_payload.sensor_id)
-			if sensor is None:
-				raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Sensor {reading_payload.sensor_id} not found")
-			sensors_cache[sensor.id] = sensor
+			raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Sensor {reading_payload.sensor_id} not found")
 
 		_validate_sensor_payload(sensor, reading_payload.data)
 
-		timestamp = reading_payload.timestamp
-		if timestamp.tzinfo is None:
-			timestamp = timestamp.replace(tzinfo=timezone.utc)
-
-		db.add(
-			SensorReading(
-				sensor_id=sensor.id,
-				timestamp=timestamp,
-				data=dict(reading_payload.data),
-			)
-		)
+		rows.append({"sensor_id": sensor.id, "timestamp": reading_payload.timestamp, "data": reading_payload.data})
 		impacted_segments.add(sensor.road_segment_id)
 
-	db.flush()
+	db.execute(insert(SensorReading), rows)
 
-	new_incident_ids: list[int] = []
+	return evaluate_incidents_for_segments(db, impacted_segments)
 
-	for segment_id in impacted_segments:
-		incidents = evaluate_incidents_for_segment(db, segment_id)
-		for incident in incidents:
-			await _populate_ai_fields(db, incident)
-			new_incident_ids.append(incident.id)
 
-	db.commit()
+def _validate_sensor_payload(sensor: Sensor, data: dict[str, Any]) -> None:
+	"""Ensure sensor payload structure matches the sensor type."""
 
-	return ReadingsIngestResponse(
-		status="accepted",
-		inserted_count=len(payload.readings),
-		new_incidents=new_incident_ids,
-	)
+	rule = _REQUIRED_PAYLOAD_KEYS.get(sensor.type)
+	if rule is None:
+		return
 
+	required_keys, detail = rule
+	if required_keys - data.keys():
+		raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
 
-def _validate_sensor_payload(sensor: Sensor, data: dict[str, Any]) -> None:
-	"""Ensure sensor payload structure matches the sensor type."""
+	for key in required_keys & _NUMERIC_PAYLOAD_KEYS:
+		if not _is_numeric(data[key]):
+			raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"{key} must be a number")
 
-	if sensor.type == SensorType.TRAFFIC_FLOW:
-		if "vehicles_per_minute" not in data:
-			raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Missing vehicles_per_minute for flow sensor")
-	elif sensor.type == SensorType.SPEED:
-		if "avg_speed_kmh" not in data:
-			raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Missing avg_speed_kmh for speed sensor")
-	elif sensor.type == SensorType.STOPPED_VEHICLE:
-		if "stopped_count" not in data or "lane_blocked" not in data:
-			raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Missing stopped_count or lane_blocked for stopped vehicle sensor")
 
+def _is_numeric(value: object) -> bool:
+	"""Return True for finite numbers and numeric strings, which both Python and SQL can cast to float."""
 
-async def _populate_ai_fields(db: Session, incident: Incident) -> None:
-	"""Call the LLM to enrich an incident with AI insights."""
+	if isinstance(value, bool) or (isinstance(value, str) and "_" in value):
+		return False
+	try:
+		return math.isfinite(float(value))
+	except (TypeError, ValueError):
+		return False
 
-	segment = incident.road_segment or db.get(RoadSegment, incident.road_segment_id)
-	if segment is None:
-		return
 
-	readings_bundle = collect_recent_readings(db, incident.road_segment_id)
-	ai_fields = await analyze_incident_with_llm(incident, segment, readings_bundle.as_dict())
+async def _populate_ai_fields(db: Session, incidents: list[Incident]) -> None:
+	"""Enrich incidents with AI insights using a single batched LLM request."""
+
+	if not incidents:
+		return
 
-	incident.ai_summary = ai_fields.get("ai_summary")
-	incident.ai_cause = ai_fields.get("ai_cause")
-	incident.ai_recommendation = ai_fields.get("ai_recommendation")
+	contexts = await run_in_threadpool(_llm_contexts, db, incidents)
+	results = await analyze_incidents_with_llm(contexts)
+
+	for incident, _, _ in contexts:
+		ai_fields = results[incident.id]
+		incident.ai_summary = ai_fields.get("ai_summary")
+		incident.ai_cause = ai_fields.get("ai_cause")
+		incident.ai_recommendation = ai_fields.get("ai_recommendation")
+
+
+def _llm_contexts(db: Session, incidents: list[Incident]) -> list[IncidentContext]:
+	"""Load the segment and recent readings the LLM prompt needs for each incident."""
+
+	contexts: list[IncidentContext] = []
+	bundles: dict[int, dict[str, list[SensorReading]]] = {}
+	for incident in incidents:
+		segment = incident.road_segment or db.get(RoadSegment, incident.road_segment_id)
+		if segment is None:
+			continue
+		if incident.road_segment_id not in bundles:
+			bundles[incident.road_segment_id] = collect_recent_readings(db, incident.road_segment_id).as_dict()
+		contexts.append((incident, segment, bundles[incident.road_segment_id]))
+	return contexts
@@ -1,7 +1,8 @@
 """Road segment endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session
 
 from ..database import get_db
@@ -10,9 +11,18 @@ from ..schemas import RoadSegment as RoadSegmentSchema
 
 router = APIRouter(prefix="/api/segments", tags=["segments"])
 
+_SEGMENT_COLUMNS = tuple(getattr(RoadSegment, name) for name in RoadSegmentSchema.model_fields)
 
-@router.get("/", response_model=list[RoadSegmentSchema])
-async def list_segments(db: Session = Depends(get_db)) -> list[RoadSegment]:
-	"""Return all configured road segments."""
 
-	return db.query(RoadSegment).order_by(RoadSegment.id.asc()).all()
+@router.get("/", response_model=list[RoadSegmentSchema], response_model_exclude_none=True)
+def list_segments(
+	limit: int = Query(default=100, ge=1, le=1000),
+	after_id: int | None = Query(default=None),
+	db: Session = Depends(get_db),
+) -> list[Row]:
+	"""Return road segments ordered by id, one keyset page at a time."""
+
+	stmt = select(*_SEGMENT_COLUMNS).order_by(RoadSegment.id.asc())
+	if after_id is not None:
+		stmt = stmt.where(RoadSegment.id > after_id)
+	return db.execute(stmt.limit(limit)).all()
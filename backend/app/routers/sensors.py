@@ -1,7 +1,8 @@
 """Sensor endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session
 
 from ..database import get_db
@@ -10,9 +11,18 @@ from ..schemas import Sensor as SensorSchema
 
 router = APIRouter(prefix="/api/sensors", tags=["sensors"])
 
+_SENSOR_COLUMNS = tuple(getattr(Sensor, name) for name in SensorSchema.model_fields)
 
-@router.get("/", response_model=list[SensorSchema])
-async def list_sensors(db: Session = Depends(get_db)) -> list[Sensor]:
-	"""Return all sensors."""
 
-	return db.query(Sensor).order_by(Sensor.id.asc()).all()
+@router.get("/", response_model=list[SensorSchema], response_model_exclude_none=True)
+def list_sensors(
+	limit: int = Query(default=100, ge=1, le=1000),
+	after_id: int | None = Query(default=None),
+	db: Session = Depends(get_db),
+) -> list[Row]:
+	"""Return sensors ordered by id, one keyset page at a time."""
+
+	stmt = select(*_SENSOR_COLUMNS).order_by(Sensor.id.asc())
+	if after_id is not None:
+		stmt = stmt.where(Sensor.id > after_id)
+	return db.execute(stmt.limit(limit)).all()
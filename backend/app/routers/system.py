@@ -2,18 +2,23 @@
 from __future__ import annotations
 
 import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
-from sqlalchemy import func
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 
 from ..database import get_db
-from ..detection import evaluate_incidents_for_segment
-from ..llm import analyze_incident_with_llm
-from ..models import Incident, RoadSegment, Sensor, SensorReading, SensorType
+from ..detection import collect_recent_readings, evaluate_incidents_for_segment
+from ..llm import analyze_incidents_with_llm
+from ..models import Incident, IncidentSeverity, IncidentStatus, RoadSegment, Sensor, SensorReading, SensorType
+from ..reading_stats import ReadingStats, current_stats, reconcile, record_readings
+from ..settings import settings
 
 router = APIRouter(prefix="/api/system", tags=["system"])
 
@@ -40,38 +45,80 @@ class ScenarioTriggerResponse(BaseModel):
     incident_id: int | None
 
 
+@dataclass(frozen=True, slots=True)
+class ScenarioConfig:
+    """Demo incident details and reading generators for a simulated scenario."""
+    incident_type: str
+    severity: IncidentSeverity
+    ai_summary: str
+    ai_cause: str
+    ai_recommendation: str
+    speed_fn: Callable[[int], float]
+    flow_fn: Callable[[int], int]
+    stopped_fn: Callable[[int], tuple[int, bool]]
+
+
+def _no_stopped_vehicles(i: int) -> tuple[int, bool]:
+    """Stopped-vehicle generator for scenarios without lane blockage."""
+    return 0, False
+
+
+SCENARIO_CONFIG: dict[str, ScenarioConfig] = {
+    "congestion": ScenarioConfig(
+        incident_type="CONGESTION",
+        severity=IncidentSeverity.HIGH,
+        ai_summary="Heavy congestion detected on {segment_name}. Traffic flow significantly reduced with average speeds below 20 km/h.",
+        ai_cause="High traffic volume combined with possible incident ahead causing backup.",
+        ai_recommendation="Consider alternate routes. Dispatch traffic management team to assess.",
+        # Speed drops from 65 to 15 km/h; high flow initially, then drops as congestion builds
+        speed_fn=lambda i: max(15, 65 - (i * 5) + random.uniform(-3, 3)),
+        flow_fn=lambda i: max(10, 45 - (i * 3) + random.randint(-5, 5)),
+        stopped_fn=_no_stopped_vehicles,
+    ),
+    "stopped_vehicle": ScenarioConfig(
+        incident_type="STOPPED_VEHICLE",
+        severity=IncidentSeverity.MEDIUM,
+        ai_summary="Stopped vehicle detected on {segment_name}. Lane partially blocked.",
+        ai_cause="Possible vehicle breakdown or minor collision.",
+        ai_recommendation="Dispatch roadside assistance. Alert drivers via variable message signs.",
+        # Speed drops moderately then recovers slightly; moderate flow reduction
+        speed_fn=lambda i: 45 - (i * 2) + random.uniform(-5, 5) if i < 7 else 35 + random.uniform(-5, 5),
+        flow_fn=lambda i: 35 - (i * 1) + random.randint(-3, 3),
+        stopped_fn=lambda i: (random.randint(1, 3), True) if i >= 5 else (0, False),
+    ),
+    "multi_lane_slowdown": ScenarioConfig(
+        incident_type="MULTI_LANE_SLOWDOWN",
+        severity=IncidentSeverity.HIGH,
+        ai_summary="Severe traffic slowdown across multiple lanes on {segment_name}. Near standstill conditions.",
+        ai_cause="Major incident or accident causing widespread lane blockage.",
+        ai_recommendation="Urgent: Dispatch emergency response. Consider temporary road closure and activate detour routing.",
+        # Severe speed drop and severe flow reduction
+        speed_fn=lambda i: max(5, 60 - (i * 6) + random.uniform(-2, 2)),
+        flow_fn=lambda i: max(5, 40 - (i * 4) + random.randint(-3, 3)),
+        stopped_fn=lambda i: (random.randint(2, 5), True) if i >= 3 else (0, False),
+    ),
+}
+
+
 # Track server start time for uptime
 _server_start_time = datetime.now(timezone.utc)
 
 
 @router.get("/status", response_model=SystemStatusResponse)
-async def get_system_status(db: Session = Depends(get_db)) -> SystemStatusResponse:
+def get_system_status(db: Session = Depends(get_db)) -> SystemStatusResponse:
     """Get comprehensive system diagnostics."""
     
     now = datetime.now(timezone.utc)
-    one_minute_ago = now - timedelta(minutes=1)
-    
-    # Count total readings
-    total_readings = db.query(func.count(SensorReading.id)).scalar() or 0
-    
-    # Count readings in last minute
-    readings_last_minute = db.query(func.count(SensorReading.id)).filter(
-        SensorReading.timestamp >= one_minute_ago
-    ).scalar() or 0
-    
-    # Count incidents
-    total_incidents = db.query(func.count(Incident.id)).scalar() or 0
-    open_incidents = db.query(func.count(Incident.id)).filter(
-        Incident.status == "OPEN"
-    ).scalar() or 0
-    
-    # Get last incident time
-    last_incident = db.query(Incident).order_by(Incident.created_at.desc()).first()
-    last_incident_at = last_incident.created_at if last_incident else None
-    
-    # Get last reading time
-    last_reading = db.query(SensorReading).order_by(SensorReading.timestamp.desc()).first()
-    last_reading_at = last_reading.timestamp if last_reading else None
+    total_readings, readings_last_minute, last_reading_at = _reading_stats(db, now)
+    
+    # Incident totals, open count and latest creation time in one scan
+    total_incidents, open_incidents, last_incident_at = db.execute(
+        select(
+            func.count(Incident.id),
+            func.count(Incident.id).filter(Incident.status == IncidentStatus.OPEN),
+            func.max(Incident.created_at),
+        )
+    ).one()
     
     # Calculate uptime
     uptime = (now - _server_start_time).total_seconds()
@@ -90,6 +137,27 @@ async def get_system_status(db: Session = Depends(get_db)) -> SystemStatusRespon
     )
 
 
+def _reading_stats(db: Session, now: datetime) -> ReadingStats:
+    """Return reading counters, rescanning the table at most once per status cache TTL."""
+    
+    stats = current_stats(settings.status_cache_ttl_seconds)
+    if stats is not None:
+        return stats
+    
+    # Reading totals, last-minute count and latest timestamp in one scan
+    started_at = time.monotonic()
+    total_readings, readings_last_minute, last_reading_at = db.execute(
+        select(
+            func.count(SensorReading.id),
+            func.count(SensorReading.id).filter(SensorReading.timestamp >= now - timedelta(minutes=1)),
+            func.max(SensorReading.timestamp),
+        )
+    ).one()
+    
+    # Resync the in-process counters so readings from other workers or restarts are not missed
+    return reconcile(total_readings, readings_last_minute, last_reading_at, started_at)
+
+
 async def _create_readings_and_detect(
     db: Session,
     segment_id: int,
@@ -116,18 +184,21 @@ async def _create_readings_and_detect(
     
     # Run detection
     incidents = evaluate_incidents_for_segment(db, segment_id)
-    incident_id = None
-    
-    for incident in incidents:
-        segment = db.get(RoadSegment, segment_id)
-        if segment:
-            from ..detection import collect_recent_readings
-            readings_bundle = collect_recent_readings(db, segment_id)
-            ai_fields = await analyze_incident_with_llm(incident, segment, readings_bundle.as_dict())
-            incident.ai_summary = ai_fields.get("ai_summary")
-            incident.ai_cause = ai_fields.get("ai_cause")
-            incident.ai_recommendation = ai_fields.get("ai_recommendation")
-        incident_id = incident.id
+    incident_id = incidents[-1].id if incidents else None
+    
+    # Segment and readings are shared by every incident on this segment; enrich them in one batched request
+    contexts = []
+    segment = db.get(RoadSegment, segment_id) if incidents else None
+    if segment:
+        readings = collect_recent_readings(db, segment_id).as_dict()
+        contexts = [(incident, segment, readings) for incident in incidents]
+    
+    results = await analyze_incidents_with_llm(contexts)
+    for incident, _, _ in contexts:
+        ai_fields = results[incident.id]
+        incident.ai_summary = ai_fields.get("ai_summary")
+        incident.ai_cause = ai_fields.get("ai_cause")
+        incident.ai_recommendation = ai_fields.get("ai_recommendation")
     
     db.commit()
     return incident_id
@@ -137,238 +208,117 @@ def _create_historical_readings(
     db: Session,
     segment_id: int,
     scenario_type: str,
-) -> int:
+) -> list[dict[str, Any]]:
     """Create realistic historical sensor readings for charts display."""
     
+    config = SCENARIO_CONFIG[scenario_type]
     now = datetime.now(timezone.utc)
     sensors = db.query(Sensor).filter(Sensor.road_segment_id == segment_id).all()
     sensor_by_type: dict[SensorType, Sensor] = {s.type: s for s in sensors}
     
-    readings_created = 0
+    speed_sensor = sensor_by_type.get(SensorType.SPEED)
+    flow_sensor = sensor_by_type.get(SensorType.TRAFFIC_FLOW)
+    stopped_sensor = sensor_by_type.get(SensorType.STOPPED_VEHICLE)
+    
+    rows: list[dict[str, Any]] = []
     
     # Generate 10 minutes of historical data (one reading per minute)
     for i in range(10):
         timestamp = now - timedelta(minutes=10 - i)
         
-        # Speed sensor readings - show degradation for incidents
-        speed_sensor = sensor_by_type.get(SensorType.SPEED)
         if speed_sensor:
-            if scenario_type == "congestion":
-                # Speed drops from 65 to 15 km/h
-                speed = max(15, 65 - (i * 5) + random.uniform(-3, 3))
-            elif scenario_type == "stopped_vehicle":
-                # Speed drops moderately then recovers slightly
-                speed = 45 - (i * 2) + random.uniform(-5, 5) if i < 7 else 35 + random.uniform(-5, 5)
-            else:  # multi_lane_slowdown
-                # Severe speed drop
-                speed = max(5, 60 - (i * 6) + random.uniform(-2, 2))
-            
-            db.add(SensorReading(
-                sensor_id=speed_sensor.id,
-                timestamp=timestamp,
-                data={"avg_speed_kmh": round(speed, 1)},
-            ))
-            readings_created += 1
+            rows.append({
+                "sensor_id": speed_sensor.id,
+                "timestamp": timestamp,
+                "data": {"avg_speed_kmh": round(config.speed_fn(i), 1)},
+            })
         
-        # Traffic flow sensor readings
-        flow_sensor = sensor_by_type.get(SensorType.TRAFFIC_FLOW)
         if flow_sensor:
-            if scenario_type == "congestion":
-                # High flow initially, then drops as congestion builds
-                flow = max(10, 45 - (i * 3) + random.randint(-5, 5))
-            elif scenario_type == "stopped_vehicle":
-                # Moderate flow reduction
-                flow = 35 - (i * 1) + random.randint(-3, 3)
-            else:  # multi_lane_slowdown
-                # Severe flow reduction
-                flow = max(5, 40 - (i * 4) + random.randint(-3, 3))
-            
-            db.add(SensorReading(
-                sensor_id=flow_sensor.id,
-                timestamp=timestamp,
-                data={"vehicles_per_minute": flow},
-            ))
-            readings_created += 1
+            rows.append({
+                "sensor_id": flow_sensor.id,
+                "timestamp": timestamp,
+                "data": {"vehicles_per_minute": config.flow_fn(i)},
+            })
         
-        # Stopped vehicle sensor readings
-        stopped_sensor = sensor_by_type.get(SensorType.STOPPED_VEHICLE)
         if stopped_sensor:
-            if scenario_type == "stopped_vehicle" and i >= 5:
-                stopped_count = random.randint(1, 3)
-                lane_blocked = True
-            elif scenario_type == "multi_lane_slowdown" and i >= 3:
-                stopped_count = random.randint(2, 5)
-                lane_blocked = True
-            else:
-                stopped_count = 0
-                lane_blocked = False
-            
-            db.add(SensorReading(
-                sensor_id=stopped_sensor.id,
-                timestamp=timestamp,
-                data={"stopped_count": stopped_count, "lane_blocked": lane_blocked},
-            ))
-            readings_created += 1
-    
-    db.flush()
-    return readings_created
+            stopped_count, lane_blocked = config.stopped_fn(i)
+            rows.append({
+                "sensor_id": stopped_sensor.id,
+                "timestamp": timestamp,
+                "data": {"stopped_count": stopped_count, "lane_blocked": lane_blocked},
+            })
+    
+    if rows:
+        db.execute(insert(SensorReading), rows)
+    return rows
 
 
-@router.post("/scenario/congestion", response_model=ScenarioTriggerResponse)
-async def trigger_congestion_scenario(db: Session = Depends(get_db)) -> ScenarioTriggerResponse:
-    """Simulate a congestion event with low speed and high flow."""
+def _trigger_scenario(db: Session, scenario: str) -> ScenarioTriggerResponse:
+    """Seed chart history and open a demo incident for the named scenario."""
+    
+    config = SCENARIO_CONFIG[scenario]
     
     # Rotate through segments for variety
     segments = db.query(RoadSegment).all()
     if not segments:
         return ScenarioTriggerResponse(
             status="error",
-            scenario="congestion",
+            scenario=scenario,
             readings_created=0,
             incident_id=None,
         )
     
-    # Find a segment without an open congestion incident, or use first
-    segment = segments[0]
-    for seg in segments:
-        existing = db.query(Incident).filter(
-            Incident.road_segment_id == seg.id,
-            Incident.type == "CONGESTION",
-            Incident.status == "OPEN",
-        ).first()
-        if not existing:
-            segment = seg
-            break
+    # Find a segment without an open incident of this type, or use first
+    busy = set(db.execute(
+        select(Incident.road_segment_id).where(
+            Incident.type == config.incident_type,
+            Incident.status == IncidentStatus.OPEN,
+        )
+    ).scalars())
+    segment = next((seg for seg in segments if seg.id not in busy), segments[0])
     
     # Create historical readings for the charts
-    readings_created = _create_historical_readings(db, segment.id, "congestion")
+    readings = _create_historical_readings(db, segment.id, scenario)
     
     # Directly create incident for demo (bypass detection rules)
     now = datetime.now(timezone.utc)
     incident = Incident(
         road_segment_id=segment.id,
-        status="OPEN",
-        severity="HIGH",
-        type="CONGESTION",
+        status=IncidentStatus.OPEN,
+        severity=config.severity,
+        type=config.incident_type,
         rule_triggered="DEMO_SCENARIO",
-        ai_summary=f"Heavy congestion detected on {segment.name}. Traffic flow significantly reduced with average speeds below 20 km/h.",
-        ai_cause="High traffic volume combined with possible incident ahead causing backup.",
-        ai_recommendation="Consider alternate routes. Dispatch traffic management team to assess.",
+        ai_summary=config.ai_summary.format(segment_name=segment.name),
+        ai_cause=config.ai_cause,
+        ai_recommendation=config.ai_recommendation,
         created_at=now,
         updated_at=now,
     )
     db.add(incident)
     db.commit()
+    record_readings((row["timestamp"] for row in readings), committed_at=time.monotonic())
     
     return ScenarioTriggerResponse(
         status="success",
-        scenario="congestion",
-        readings_created=readings_created,
+        scenario=scenario,
+        readings_created=len(readings),
         incident_id=incident.id,
     )
 
 
+@router.post("/scenario/congestion", response_model=ScenarioTriggerResponse)
+def trigger_congestion_scenario(db: Session = Depends(get_db)) -> ScenarioTriggerResponse:
+    """Simulate a congestion event with low speed and high flow."""
+    return _trigger_scenario(db, "congestion")
+
+
 @router.post("/scenario/stopped-vehicle", response_model=ScenarioTriggerResponse)
-async def trigger_stopped_vehicle_scenario(db: Session = Depends(get_db)) -> ScenarioTriggerResponse:
+def trigger_stopped_vehicle_scenario(db: Session = Depends(get_db)) -> ScenarioTriggerResponse:
     """Simulate a stopped vehicle blocking a lane."""
-    
-    segments = db.query(RoadSegment).all()
-    if not segments:
-        return ScenarioTriggerResponse(
-            status="error",
-            scenario="stopped_vehicle",
-            readings_created=0,
-            incident_id=None,
-        )
-    
-    # Find a segment without an open stopped vehicle incident
-    segment = segments[0]
-    for seg in segments:
-        existing = db.query(Incident).filter(
-            Incident.road_segment_id == seg.id,
-            Incident.type == "STOPPED_VEHICLE",
-            Incident.status == "OPEN",
-        ).first()
-        if not existing:
-            segment = seg
-            break
-    
-    # Create historical readings for the charts
-    readings_created = _create_historical_readings(db, segment.id, "stopped_vehicle")
-    
-    # Directly create incident for demo
-    now = datetime.now(timezone.utc)
-    incident = Incident(
-        road_segment_id=segment.id,
-        status="OPEN",
-        severity="MEDIUM",
-        type="STOPPED_VEHICLE",
-        rule_triggered="DEMO_SCENARIO",
-        ai_summary=f"Stopped vehicle detected on {segment.name}. Lane partially blocked.",
-        ai_cause="Possible vehicle breakdown or minor collision.",
-        ai_recommendation="Dispatch roadside assistance. Alert drivers via variable message signs.",
-        created_at=now,
-        updated_at=now,
-    )
-    db.add(incident)
-    db.commit()
-    
-    return ScenarioTriggerResponse(
-        status="success",
-        scenario="stopped_vehicle",
-        readings_created=readings_created,
-        incident_id=incident.id,
-    )
+    return _trigger_scenario(db, "stopped_vehicle")
 
 
 @router.post("/scenario/multi-lane-slowdown", response_model=ScenarioTriggerResponse)
-async def trigger_multi_lane_slowdown_scenario(db: Session = Depends(get_db)) -> ScenarioTriggerResponse:
+def trigger_multi_lane_slowdown_scenario(db: Session = Depends(get_db)) -> ScenarioTriggerResponse:
     """Simulate a severe multi-lane slowdown with stopped vehicles."""
-    
-    segments = db.query(RoadSegment).all()
-    if not segments:
-        return ScenarioTriggerResponse(
-            status="error",
-            scenario="multi_lane_slowdown",
-            readings_created=0,
-            incident_id=None,
-        )
-    
-    # Find a segment without an open multi-lane incident
-    segment = segments[0]
-    for seg in segments:
-        existing = db.query(Incident).filter(
-            Incident.road_segment_id == seg.id,
-            Incident.type == "MULTI_LANE_SLOWDOWN",
-            Incident.status == "OPEN",
-        ).first()
-        if not existing:
-            segment = seg
-            break
-    
-    # Create historical readings for the charts
-    readings_created = _create_historical_readings(db, segment.id, "multi_lane_slowdown")
-    
-    # Directly create HIGH severity incident for demo
-    now = datetime.now(timezone.utc)
-    incident = Incident(
-        road_segment_id=segment.id,
-        status="OPEN",
-        severity="HIGH",
-        type="MULTI_LANE_SLOWDOWN",
-        rule_triggered="DEMO_SCENARIO",
-        ai_summary=f"Severe traffic slowdown across multiple lanes on {segment.name}. Near standstill conditions.",
-        ai_cause="Major incident or accident causing widespread lane blockage.",
-        ai_recommendation="Urgent: Dispatch emergency response. Consider temporary road closure and activate detour routing.",
-        created_at=now,
-        updated_at=now,
-    )
-    db.add(incident)
-    db.commit()
-    
-    return ScenarioTriggerResponse(
-        status="success",
-        scenario="multi_lane_slowdown",
-        readings_created=readings_created,
-        incident_id=incident.id,
-    )
+    return _trigger_scenario(db, "multi_lane_slowdown")
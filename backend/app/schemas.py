@@ -1,10 +1,10 @@
 """Pydantic schemas for Beltways RTIIS APIs."""
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from .models import IncidentSeverity, IncidentStatus, SensorType
 
@@ -49,6 +49,12 @@ class SensorReadingPayload(BaseModel):
     timestamp: datetime
     data: dict[str, Any]
 
+    @field_validator("timestamp")
+    @classmethod
+    def _assume_utc(cls, value: datetime) -> datetime:
+        """Treat naive timestamps as UTC so downstream code can rely on tz-aware values."""
+        return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
 
 class SensorReading(BaseModel):
     """Serialized sensor reading."""
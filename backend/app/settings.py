@@ -1,26 +1,49 @@
 """Application settings management."""
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+_BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Resolved once at import; only files that exist are handed to pydantic-settings
+_ENV_FILES = tuple(
+    path for path in (_BACKEND_DIR / ".env", _BACKEND_DIR.parent / ".env", Path(".env")) if path.exists()
+)
+
 
 class Settings(BaseSettings):
     """Centralized runtime configuration."""
 
     model_config = SettingsConfigDict(
-        env_file=(
-            Path(__file__).resolve().parents[1] / ".env",
-            Path(__file__).resolve().parents[2] / ".env",
-            ".env",
-        ),
+        env_file=_ENV_FILES,
         env_file_encoding="utf-8",
         extra="ignore",
     )
 
     database_url: str = Field(default="sqlite:///./rtiis.db", env="DATABASE_URL")
+    db_pool_size: int = Field(default=20, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=40, env="DB_MAX_OVERFLOW")
+    db_pool_recycle_seconds: int = Field(default=1800, env="DB_POOL_RECYCLE_SECONDS")
     openai_api_key: str | None = Field(default=None, env="OPENAI_API_KEY")
     llm_provider: str = Field(default="openai", env="LLM_PROVIDER")
+    ingest_concurrency: int = Field(default=8, env="INGEST_CONCURRENCY")
+    ingest_acquire_timeout_seconds: float = Field(default=1.0, env="INGEST_ACQUIRE_TIMEOUT_SECONDS")
+    status_cache_ttl_seconds: float = Field(default=5.0, env="STATUS_CACHE_TTL_SECONDS")
+    cors_origins: str = Field(default="http://localhost:3000,http://localhost:3001", env="CORS_ORIGINS")
+    cors_origin_regex: str | None = Field(default=None, env="CORS_ORIGIN_REGEX")
+
+    @property
+    def cors_origin_list(self) -> list[str]:
+        """Comma-separated CORS origins as a list."""
+        return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings instance, usable as a FastAPI dependency."""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
@@ -12,7 +12,11 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from app.detection import evaluate_incidents_for_segment  # noqa: E402
+from app.detection import (  # noqa: E402
+    evaluate_incidents_for_all_segments,
+    evaluate_incidents_for_segment,
+    evaluate_incidents_for_segments,
+)
 from app.models import (  # noqa: E402
     Base,
     IncidentSeverity,
@@ -30,6 +34,28 @@ def _build_session() -> Session:
     return sessionmaker(bind=engine, autoflush=False, autocommit=False)()
 
 
+def _add_blocked_segments(db: Session, codes: list[str]) -> list[RoadSegment]:
+    now = datetime.now(timezone.utc)
+    segments = [RoadSegment(name=f"Segment {code}", code=f"SEG_{code}", direction="NORTH") for code in codes]
+    db.add_all(segments)
+    db.flush()
+
+    for segment in segments:
+        sensor = Sensor(name="Stopped", type=SensorType.STOPPED_VEHICLE, road_segment_id=segment.id)
+        db.add(sensor)
+        db.flush()
+        for seconds_ago in (90, 30):
+            db.add(
+                SensorReading(
+                    sensor_id=sensor.id,
+                    timestamp=now - timedelta(seconds=seconds_ago),
+                    data={"stopped_count": 1, "lane_blocked": True},
+                )
+            )
+    db.commit()
+    return segments
+
+
 def test_congestion_incident_created_after_flow_and_speed_drop() -> None:
     db = _build_session()
     now = datetime.now(timezone.utc)
@@ -93,6 +119,42 @@ def test_congestion_incident_created_after_flow_and_speed_drop() -> None:
     assert duplicate == []
 
 
+def test_congestion_baselines_computed_per_segment() -> None:
+    db = _build_session()
+    now = datetime.now(timezone.utc)
+
+    congested = RoadSegment(name="Congested", code="SEG_H", direction="NORTH")
+    slow_baseline = RoadSegment(name="Slow Baseline", code="SEG_I", direction="SOUTH")
+    db.add_all([congested, slow_baseline])
+    db.flush()
+
+    # Same flow history and drop on both segments; only the baseline speed differs. Pooled
+    # across segments the speed baseline would average 57.5 and neither would qualify.
+    for sensor_id, segment, baseline_speed in [(30, congested, 75), (32, slow_baseline, 40)]:
+        db.add_all(
+            [
+                Sensor(id=sensor_id, name="Flow", type=SensorType.TRAFFIC_FLOW, road_segment_id=segment.id),
+                Sensor(id=sensor_id + 1, name="Speed", type=SensorType.SPEED, road_segment_id=segment.id),
+            ]
+        )
+        for minutes_ago in (4, 3, 2, 1):
+            timestamp = now - timedelta(minutes=minutes_ago)
+            db.add(SensorReading(sensor_id=sensor_id, timestamp=timestamp, data={"vehicles_per_minute": 60}))
+            db.add(SensorReading(sensor_id=sensor_id + 1, timestamp=timestamp, data={"avg_speed_kmh": baseline_speed}))
+        for seconds_ago in (20, 10):
+            timestamp = now - timedelta(seconds=seconds_ago)
+            db.add(SensorReading(sensor_id=sensor_id, timestamp=timestamp, data={"vehicles_per_minute": 15}))
+            db.add(SensorReading(sensor_id=sensor_id + 1, timestamp=timestamp, data={"avg_speed_kmh": 20}))
+    db.commit()
+
+    incidents = evaluate_incidents_for_all_segments(db)
+    db.commit()
+
+    assert [(incident.road_segment_id, incident.type) for incident in incidents] == [(congested.id, "CONGESTION")]
+    assert incidents[0].severity == IncidentSeverity.HIGH
+    assert evaluate_incidents_for_all_segments(db) == []
+
+
 def test_stopped_vehicle_incident_detected_on_consecutive_blocked_events() -> None:
     db = _build_session()
     now = datetime.now(timezone.utc)
@@ -131,4 +193,27 @@ def test_stopped_vehicle_incident_detected_on_consecutive_blocked_events() -> No
 
     assert len(incidents) == 1
     assert incidents[0].type == "STOPPED_VEHICLE"
-    assert incidents[0].severity == IncidentSeverity.MEDIUM
\ No newline at end of file
+    assert incidents[0].severity == IncidentSeverity.MEDIUM
+
+
+def test_all_segments_evaluated_in_one_pass() -> None:
+    db = _build_session()
+    segments = _add_blocked_segments(db, ["C", "D"])
+
+    incidents = evaluate_incidents_for_all_segments(db)
+    db.commit()
+
+    assert sorted(incident.road_segment_id for incident in incidents) == sorted(s.id for s in segments)
+    assert all(incident.type == "STOPPED_VEHICLE" for incident in incidents)
+    assert evaluate_incidents_for_all_segments(db) == []
+
+
+def test_only_requested_segments_evaluated_together() -> None:
+    db = _build_session()
+    segments = _add_blocked_segments(db, ["E", "F", "G"])
+
+    requested = {segments[0].id, segments[2].id}
+    incidents = evaluate_incidents_for_segments(db, requested)
+
+    assert {incident.road_segment_id for incident in incidents} == requested
+    assert evaluate_incidents_for_segments(db, []) == []
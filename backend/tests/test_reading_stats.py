@@ -0,0 +1,47 @@
+"""Unit tests for the in-process reading counters."""
+from __future__ import annotations
+
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import reading_stats  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_counters(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(reading_stats, "_recent_batches", deque())
+    monkeypatch.setattr(reading_stats, "_recorded_batches", deque())
+    monkeypatch.setattr(reading_stats, "_reconciled_at", None)
+    monkeypatch.setattr(reading_stats, "_total_readings", 0)
+    monkeypatch.setattr(reading_stats, "_last_reading_at", None)
+
+
+def test_batch_committed_before_reconcile_query_is_not_counted_twice() -> None:
+    now = datetime.now(timezone.utc)
+    committed_at = time.monotonic()
+
+    # The status query starts after the commit, so its figures already include the batch
+    reading_stats.reconcile(3, 3, now, started_at=committed_at + 1)
+    reading_stats.record_readings([now, now, now], committed_at=committed_at)
+
+    assert reading_stats.current_stats(max_age_seconds=float("inf")) == (3, 3, now)
+
+
+def test_batch_committed_during_reconcile_query_is_replayed() -> None:
+    now = datetime.now(timezone.utc)
+    started_at = time.monotonic()
+
+    # The batch lands while the status query is running and is recorded before it reconciles
+    reading_stats.record_readings([now, now], committed_at=started_at + 1)
+    reading_stats.reconcile(5, 1, None, started_at=started_at)
+
+    assert reading_stats.current_stats(max_age_seconds=float("inf")) == (7, 3, now)
@@ -0,0 +1,179 @@
+"""API tests for sensor reading ingestion."""
+from __future__ import annotations
+
+import asyncio
+import sys
+from collections.abc import Generator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import reading_stats  # noqa: E402
+from app.database import get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Base, RoadSegment, Sensor, SensorReading, SensorType  # noqa: E402
+from app.routers import readings as readings_router  # noqa: E402
+from app.routers import system as system_router  # noqa: E402
+
+
+@pytest.fixture()
+def db_session() -> Generator[sessionmaker[Session], None, None]:
+    engine = create_engine(
+        "sqlite://",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+    with factory() as db:
+        segment = RoadSegment(name="Test Segment", code="SEG_A", direction="NORTH")
+        db.add(segment)
+        db.flush()
+        db.add_all(
+            [
+                Sensor(id=1, name="Flow", type=SensorType.TRAFFIC_FLOW, road_segment_id=segment.id),
+                Sensor(id=2, name="Speed", type=SensorType.SPEED, road_segment_id=segment.id),
+                Sensor(id=3, name="Stopped", type=SensorType.STOPPED_VEHICLE, road_segment_id=segment.id),
+            ]
+        )
+        db.commit()
+
+    def _get_db() -> Generator[Session, None, None]:
+        with factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _get_db
+    yield factory
+    app.dependency_overrides.clear()
+
+
+def test_ingest_stores_readings_and_detects_stopped_vehicle(db_session: sessionmaker[Session]) -> None:
+    client = TestClient(app)
+    now = datetime.now(timezone.utc)
+    readings = [
+        {
+            "sensor_id": 3,
+            "timestamp": (now - timedelta(seconds=seconds_ago)).isoformat(),
+            "data": {"stopped_count": 1, "lane_blocked": True},
+        }
+        for seconds_ago in (60, 5)
+    ]
+    readings.append({"sensor_id": 1, "timestamp": now.isoformat(), "data": {"vehicles_per_minute": 40}})
+
+    response = client.post("/api/readings/", json={"readings": readings})
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["inserted_count"] == 3
+    assert len(body["new_incidents"]) == 1
+    with db_session() as db:
+        assert db.execute(select(func.count(SensorReading.id))).scalar_one() == 3
+
+
+def test_ingest_rejects_unknown_sensor(db_session: sessionmaker[Session]) -> None:
+    client = TestClient(app)
+    payload = {
+        "readings": [
+            {"sensor_id": 1, "timestamp": datetime.now(timezone.utc).isoformat(), "data": {"vehicles_per_minute": 40}},
+            {"sensor_id": 99, "timestamp": datetime.now(timezone.utc).isoformat(), "data": {}},
+        ]
+    }
+
+    response = client.post("/api/readings/", json=payload)
+
+    assert response.status_code == 404
+    with db_session() as db:
+        assert db.execute(select(func.count(SensorReading.id))).scalar_one() == 0
+
+
+def test_ingest_returns_503_when_at_capacity(
+    db_session: sessionmaker[Session], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(readings_router, "_ingest_slots", asyncio.Semaphore(0))
+    monkeypatch.setattr(readings_router.settings, "ingest_acquire_timeout_seconds", 0.01)
+    client = TestClient(app)
+    payload = {
+        "readings": [
+            {"sensor_id": 1, "timestamp": datetime.now(timezone.utc).isoformat(), "data": {"vehicles_per_minute": 40}},
+        ]
+    }
+
+    response = client.post("/api/readings/", json=payload)
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_ingest_rejects_payload_missing_required_keys(db_session: sessionmaker[Session]) -> None:
+    client = TestClient(app)
+    payload = {
+        "readings": [
+            {"sensor_id": 3, "timestamp": datetime.now(timezone.utc).isoformat(), "data": {"stopped_count": 1}},
+        ]
+    }
+
+    response = client.post("/api/readings/", json=payload)
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Missing stopped_count or lane_blocked for stopped vehicle sensor"
+
+
+@pytest.mark.parametrize("value", [True, "n/a", None, "nan"])
+def test_ingest_rejects_non_numeric_reading_values(db_session: sessionmaker[Session], value: object) -> None:
+    client = TestClient(app)
+    payload = {
+        "readings": [
+            {"sensor_id": 2, "timestamp": datetime.now(timezone.utc).isoformat(), "data": {"avg_speed_kmh": value}},
+        ]
+    }
+
+    response = client.post("/api/readings/", json=payload)
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "avg_speed_kmh must be a number"
+
+
+def test_ingest_accepts_numeric_string_reading_values(db_session: sessionmaker[Session]) -> None:
+    client = TestClient(app)
+    payload = {
+        "readings": [
+            {"sensor_id": 2, "timestamp": datetime.now(timezone.utc).isoformat(), "data": {"avg_speed_kmh": "42.5"}},
+        ]
+    }
+
+    response = client.post("/api/readings/", json=payload)
+
+    assert response.status_code == 202
+
+
+def test_status_counts_ingested_readings_between_refreshes(
+    db_session: sessionmaker[Session], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(reading_stats, "_reconciled_at", None)
+    monkeypatch.setattr(system_router.settings, "status_cache_ttl_seconds", 60.0)
+    client = TestClient(app)
+    assert client.get("/api/system/status").json()["readings_last_minute"] == 0
+
+    now = datetime.now(timezone.utc)
+    readings = [
+        {"sensor_id": 1, "timestamp": now.isoformat(), "data": {"vehicles_per_minute": 40}},
+        {"sensor_id": 2, "timestamp": now.isoformat(), "data": {"avg_speed_kmh": 80}},
+        {"sensor_id": 2, "timestamp": (now - timedelta(minutes=5)).isoformat(), "data": {"avg_speed_kmh": 80}},
+    ]
+    client.post("/api/readings/", json={"readings": readings})
+
+    body = client.get("/api/system/status").json()
+    assert body["readings_last_minute"] == 2
+    assert body["total_readings"] == 3
+    assert datetime.fromisoformat(body["last_reading_at"]) == now
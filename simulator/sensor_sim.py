@@ -1,18 +1,19 @@
 """Sensor simulator for Beltways RTIIS."""
 from __future__ import annotations
 
+import asyncio
 import os
 import random
-import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable
 
 import httpx
 
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 INTERVAL_SECONDS = int(os.getenv("SIM_INTERVAL_SECONDS", "5"))
 READINGS_ENDPOINT = f"{BACKEND_URL}/api/readings/"
+MAX_INFLIGHT_REQUESTS = 2
 
 
 @dataclass
@@ -36,23 +37,33 @@ class SensorSimulator:
         self.cycle_count = 0
         self.anomaly_cycles_remaining = 0
 
-    def run(self) -> None:
+    async def run(self) -> None:
         print(f"Starting simulator. Posting to {READINGS_ENDPOINT} every {INTERVAL_SECONDS}s.")
-        with httpx.Client(timeout=10) as client:
+        limits = httpx.Limits(max_connections=MAX_INFLIGHT_REQUESTS, max_keepalive_connections=MAX_INFLIGHT_REQUESTS)
+        inflight: set[asyncio.Task[None]] = set()
+        async with httpx.AsyncClient(timeout=10, limits=limits) as client:
             while True:
                 self.cycle_count += 1
                 anomaly_active = self._should_trigger_anomaly()
                 payload = self._build_payload(anomaly_active)
 
-                try:
-                    response = client.post(READINGS_ENDPOINT, json=payload)
-                    response.raise_for_status()
-                    status = "ANOMALY" if anomaly_active else "normal"
-                    print(f"[{status}] Sent {len(payload['readings'])} readings")
-                except httpx.HTTPError as exc:
-                    print(f"Failed to send readings: {exc}")
+                # Keep ticking while requests are in flight, but never queue more than the cap
+                if len(inflight) >= MAX_INFLIGHT_REQUESTS:
+                    await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+                task = asyncio.create_task(self._send(client, payload, anomaly_active))
+                inflight.add(task)
+                task.add_done_callback(inflight.discard)
 
-                time.sleep(INTERVAL_SECONDS)
+                await asyncio.sleep(INTERVAL_SECONDS)
+
+    async def _send(self, client: httpx.AsyncClient, payload: dict[str, Any], anomaly: bool) -> None:
+        try:
+            response = await client.post(READINGS_ENDPOINT, json=payload)
+            response.raise_for_status()
+            status = "ANOMALY" if anomaly else "normal"
+            print(f"[{status}] Sent {len(payload['readings'])} readings")
+        except httpx.HTTPError as exc:
+            print(f"Failed to send readings: {exc}")
 
     def _should_trigger_anomaly(self) -> bool:
         if self.anomaly_cycles_remaining > 0:
@@ -67,45 +78,50 @@ class SensorSimulator:
         return False
 
     def _build_payload(self, anomaly: bool) -> dict[str, Any]:
+        # One timestamp per tick, shared by every reading in the batch
         timestamp = datetime.now(timezone.utc).isoformat()
-        readings = []
+        generate = self._generate_reading
+        return {
+            "readings": [
+                {"sensor_id": sensor.sensor_id, "timestamp": timestamp, "data": generate(sensor, anomaly)}
+                for sensor in SENSORS
+            ]
+        }
 
-        for sensor in SENSORS:
-            data = self._generate_reading(sensor, anomaly)
-            readings.append({
-                "sensor_id": sensor.sensor_id,
-                "timestamp": timestamp,
-                "data": data,
-            })
+    def _generate_reading(self, sensor: SensorConfig, anomaly: bool) -> dict[str, Any]:
+        generator = _READING_GENERATORS.get(sensor.sensor_type)
+        if generator is None:
+            raise ValueError(f"Unsupported sensor type {sensor.sensor_type}")
+        return generator(sensor.baseline, anomaly)
 
-        return {"readings": readings}
 
-    def _generate_reading(self, sensor: SensorConfig, anomaly: bool) -> dict[str, Any]:
-        if sensor.sensor_type == "TRAFFIC_FLOW":
-            if anomaly:
-                value = sensor.baseline * random.uniform(0.1, 0.2)
-            else:
-                value = sensor.baseline * random.uniform(0.9, 1.1)
-            return {"vehicles_per_minute": round(value, 1)}
+def _flow_reading(baseline: float, anomaly: bool) -> dict[str, Any]:
+    low, high = (0.1, 0.2) if anomaly else (0.9, 1.1)
+    return {"vehicles_per_minute": round(baseline * random.uniform(low, high), 1)}
+
+
+def _speed_reading(baseline: float, anomaly: bool) -> dict[str, Any]:
+    value = random.uniform(10, 30) if anomaly else baseline + random.uniform(-10, 10)
+    return {"avg_speed_kmh": round(value, 1)}
+
 
-        if sensor.sensor_type == "SPEED":
-            if anomaly:
-                value = random.uniform(10, 30)
-            else:
-                value = sensor.baseline + random.uniform(-10, 10)
-            return {"avg_speed_kmh": round(value, 1)}
+def _stopped_vehicle_reading(baseline: float, anomaly: bool) -> dict[str, Any]:
+    if anomaly:
+        return {"stopped_count": random.randint(1, 2), "lane_blocked": True}
+    return {"stopped_count": 0, "lane_blocked": False}
 
-        if sensor.sensor_type == "STOPPED_VEHICLE":
-            if anomaly:
-                return {"stopped_count": random.randint(1, 2), "lane_blocked": True}
-            return {"stopped_count": 0, "lane_blocked": False}
 
-        raise ValueError(f"Unsupported sensor type {sensor.sensor_type}")
+# Resolved once per sensor type instead of walking a type branch chain for every reading
+_READING_GENERATORS: dict[str, Callable[[float, bool], dict[str, Any]]] = {
+    "TRAFFIC_FLOW": _flow_reading,
+    "SPEED": _speed_reading,
+    "STOPPED_VEHICLE": _stopped_vehicle_reading,
+}
 
 
 def main() -> None:
     simulator = SensorSimulator()
-    simulator.run()
+    asyncio.run(simulator.run())
 
 
 if __name__ == "__main__":